@@ -83,7 +83,8 @@ class Agent(object):
             s_processed = self._process_state(state)
             action = self._choose_greedy_action(s_processed, action_space, epsilon)
             new_state, reward, done = env.step(action_space[action])
-            episode.append((state.copy(), action_space[action], reward, False))
+            # state is already a copy not modified by env, so no need to copy again
+            episode.append((state, action_space[action], reward, False))
             reward_sum += reward
             steps += 1
             if done:
@@ -4,6 +4,7 @@ A Deep Q-learning agent implementation for the NetworkAttackSimulator
 Uses Experience Replay and a seperate Target Network along with the main DQN.
 """
 from network_attack_simulator.agents.agent import Agent
+from network_attack_simulator.envs.vector_env import VectorNetworkAttackSimulator
 import random
 import numpy as np
 import time
@@ -97,7 +98,8 @@ class DQNAgent(Agent):
                  learning_rate=0.00025,
                  memory_capacity=10000,
                  batch_size=32,
-                 update_target_freq=1000):
+                 update_target_freq=1000,
+                 num_envs=1):
         """
         Initialize a new Deep Q-network agent
 
@@ -113,6 +115,8 @@ class DQNAgent(Agent):
             int memory_capacity : capacity of replay buffer
             int batch_size : Q-network training batch size
             int update_target_freq : target model update frequency in terms of number of steps
+            int num_envs : number of copies of environment to collect samples from in lockstep,
+                           if 1 episodes are run one after another on the environment
         """
         self.state_size = state_size
         self.num_actions = num_actions
@@ -123,6 +127,7 @@ class DQNAgent(Agent):
         self.epsilon = max_epsilon
         self.batch_size = batch_size
         self.update_target_freq = update_target_freq
+        self.num_envs = num_envs
 
         self.brain = Brain(state_size, num_actions, hidden_units, learning_rate)
         self.memory = Memory(memory_capacity)
@@ -136,32 +141,31 @@ class DQNAgent(Agent):
         else:
             visualize_policy = 0
 
-        self.print_message("Starting training for {} episodes".format(num_episodes), verbose)
+        self.print_message("Starting training for {} episodes using {} environments"
+                           .format(num_episodes, self.num_envs), verbose)
 
         # stores timesteps and rewards for each episode
         episode_timesteps = []
         episode_rewards = []
         episode_times = []
 
-        training_start_time = time.time()
-        steps_since_update = 0
+        training_start_time = time.perf_counter()
+        deadline = None if timeout is None else training_start_time + timeout
+        self.steps_since_update = 0
 
         reporting_window = min(num_episodes / 10, 100)
 
-        for e in range(num_episodes):
-            start_time = time.time()
-            timesteps, reward = self._run_episode(env, max_steps)
-            ep_time = time.time() - start_time
+        if self.num_envs > 1:
+            episodes = self._run_vectorized_episodes(env, max_steps)
+        else:
+            episodes = self._run_episodes(env, max_steps)
+
+        for e, (timesteps, reward, ep_time) in zip(range(num_episodes), episodes):
             episode_rewards.append(reward)
             episode_timesteps.append(timesteps)
             episode_times.append(ep_time)
 
             self.epsilon = self.epsilon_decay()
-            steps_since_update += timesteps
-
-            if steps_since_update > self.update_target_freq:
-                self.brain.update_target_model()
-                steps_since_update = 0
 
             self.report_progress(e, reporting_window, episode_timesteps, verbose)
 
@@ -171,17 +175,87 @@ class DQNAgent(Agent):
                                    .format(len(gen_episode)), verbose)
                 env.render_episode(gen_episode)
 
-            if timeout is not None and time.time() - training_start_time > timeout:
+            if deadline is not None and time.perf_counter() > deadline:
                 self.print_message("Timed out after {} sec on episode {:.2f}".format(timeout, e),
                                    verbose)
                 break
 
-        total_training_time = time.time() - training_start_time
+        total_training_time = time.perf_counter() - training_start_time
         self.print_message("Training complete after {} episodes and {:.2f} sec"
                            .format(e, total_training_time), verbose)
 
         return episode_timesteps, episode_rewards, episode_times
 
+    def _run_episodes(self, env, max_steps):
+        """
+        Generate (timesteps, reward, time) for each training episode run on env
+        """
+        while True:
+            start_time = time.perf_counter()
+            timesteps, reward = self._run_episode(env, max_steps)
+            ep_time = time.perf_counter() - start_time
+            self._update_target_model(timesteps)
+            yield timesteps, reward, ep_time
+
+    def _run_vectorized_episodes(self, env, max_steps):
+        """
+        Generate (timesteps, reward, time) for each training episode, running num_envs copies of
+        env in lockstep so actions for every copy are chosen with a single batched forward pass
+        of the Q-network.
+
+        Each transition is added to replay memory and followed by one replay update, as in
+        _run_episode, so there is one parameter update per sample collected whatever num_envs is.
+        Only action selection is batched.
+
+        Episodes are generated in the order they finish, so consecutive episodes may come from
+        different copies. The time of each lockstep is split evenly between the copies, so
+        episode times sum to the time spent training.
+        """
+        venv = VectorNetworkAttackSimulator.from_env(env, self.num_envs)
+
+        s = venv.reset()
+        ep_rewards = np.zeros(self.num_envs)
+        ep_timesteps = np.zeros(self.num_envs, dtype=int)
+        ep_times = np.zeros(self.num_envs)
+
+        while True:
+            start_time = time.perf_counter()
+            a = self.act_batch(s)
+            ns, r, done = venv.step(a)
+
+            # train agent, one replay update per transition
+            for i in range(self.num_envs):
+                self.observe((s[i], a[i], r[i], None if done[i] else ns[i]))
+                self.replay()
+
+            ep_rewards += r
+            ep_timesteps += 1
+            self.steps += self.num_envs
+            self._update_target_model(self.num_envs)
+
+            # finished environments are already reset by venv, truncated ones need resetting
+            truncated = ~done & (ep_timesteps >= max_steps)
+            s = ns
+            if truncated.any():
+                s = ns.copy()
+                for i in np.flatnonzero(truncated):
+                    s[i] = venv.reset_env(i)
+
+            ep_times += (time.perf_counter() - start_time) / self.num_envs
+
+            for i in np.flatnonzero(done | truncated):
+                yield ep_timesteps[i], ep_rewards[i], ep_times[i]
+                ep_rewards[i] = 0
+                ep_timesteps[i] = 0
+                ep_times[i] = 0
+
+    def _update_target_model(self, steps):
+        """ Update target model once more than update_target_freq steps since last update """
+        self.steps_since_update += steps
+        if self.steps_since_update > self.update_target_freq:
+            self.brain.update_target_model()
+            self.steps_since_update = 0
+
     def reset(self):
         self.brain.reset()
         self.memory.reset()
@@ -232,6 +306,13 @@ class DQNAgent(Agent):
         else:
             return np.argmax(self.brain.predictOne(s))
 
+    def act_batch(self, states):
+        """ Choose action for each state in batch using epsilon greedy action selection """
+        actions = np.argmax(self.brain.predict(states), axis=1)
+        explore = np.random.rand(len(actions)) < self.epsilon
+        actions[explore] = np.random.randint(0, self.num_actions, np.count_nonzero(explore))
+        return actions
+
     def _choose_greedy_action(self, state, action_space, epsilon=0.05):
         if random.random() < epsilon:
             return random.randint(0, self.num_actions-1)
@@ -68,13 +68,14 @@ class TabularAgent(Agent):
         episode_times = []
         steps = 0
 
-        training_start_time = time.time()
+        training_start_time = time.perf_counter()
+        deadline = None if timeout is None else training_start_time + timeout
         reporting_window = min(num_episodes / 10, 100)
 
         for e in range(num_episodes):
-            start_time = time.time()
+            start_time = time.perf_counter()
             timesteps, reward = self._run_episode(env, max_steps, self.param)
-            ep_time = time.time() - start_time
+            ep_time = time.perf_counter() - start_time
             episode_rewards.append(reward)
             episode_timesteps.append(timesteps)
             episode_times.append(ep_time)
@@ -94,12 +95,12 @@ class TabularAgent(Agent):
                 env.render_episode(gen_episode)
 
             # check for timeout
-            if timeout is not None and time.time() - training_start_time > timeout:
+            if deadline is not None and time.perf_counter() > deadline:
                 self._print_message("Timed out after {} sec on episode {}".format(timeout, e),
                                     verbose)
                 break
 
-        total_training_time = time.time() - training_start_time
+        total_training_time = time.perf_counter() - training_start_time
         self._print_message("Training complete after {} episodes and {:.2f} sec"
                             .format(e, total_training_time), verbose)
 
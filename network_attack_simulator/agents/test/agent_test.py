@@ -44,14 +44,14 @@ def plot_episode_results(episode_timesteps, episode_rewards, optimal_actions,
 
 def test_agent(env, agent, num_runs, num_episodes, max_steps, avg_interval=10):
 
-    run_results_timesteps = []
-    run_results_rewards = []
+    run_results_timesteps = np.empty((num_runs, num_episodes), dtype=np.float64)
+    run_results_rewards = np.empty((num_runs, num_episodes), dtype=np.float64)
     for run in range(num_runs):
         s, r, _ = agent.train(env, num_episodes, max_steps)
-        run_results_timesteps.append(s)
-        run_results_rewards.append(r)
-    avg_run_timesteps = np.average(run_results_timesteps, axis=0)
-    avg_run_rewards = np.average(run_results_rewards, axis=0)
+        run_results_timesteps[run] = s
+        run_results_rewards[run] = r
+    avg_run_timesteps = run_results_timesteps.mean(axis=0)
+    avg_run_rewards = run_results_rewards.mean(axis=0)
 
     opt_num_actions = env.optimal_num_actions()
     print("Optimal number actions = {0}".format(opt_num_actions))
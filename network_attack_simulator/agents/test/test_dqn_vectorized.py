@@ -0,0 +1,119 @@
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from network_attack_simulator.agents import dqn
+from network_attack_simulator.envs.environment import NetworkAttackSimulator
+
+
+class StubBrain:
+    """ Stands in for the Keras Q-network, recording calls made by the agent """
+
+    def __init__(self, state_size, num_actions, hidden_units, learning_rate):
+        self.state_size = state_size
+        self.num_actions = num_actions
+        self.q_values = None
+        self.train_calls = 0
+        self.target_updates = 0
+
+    def train(self, x, y, batch_size=64, epoch=1, verbose=0):
+        self.train_calls += 1
+
+    def predict(self, s, target=False):
+        if self.q_values is not None:
+            return self.q_values(s)
+        return np.zeros((len(s), self.num_actions))
+
+    def predictOne(self, s, target=False):
+        return self.predict(s.reshape(1, self.state_size), target=target).flatten()
+
+    def update_target_model(self):
+        self.target_updates += 1
+
+    def reset(self):
+        pass
+
+
+class DQNVectorizedTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.E = 1
+        self.M = 3
+        self.N = 4
+        self.env = NetworkAttackSimulator.from_params(self.M, self.E, exploit_probs=1.0)
+
+    def get_agent(self, **kwargs):
+        # epsilon of 0 so actions are always greedy w.r.t the stub Q-values
+        with mock.patch.object(dqn, "Brain", StubBrain):
+            return dqn.DQNAgent(self.env.get_state_size(), len(self.env.action_space),
+                                min_epsilon=0.0, max_epsilon=0.0, num_envs=self.N, **kwargs)
+
+    def exploit_next_machine(self, states):
+        """ Q-values that choose exploit of the first machine not yet compromised """
+        q = np.zeros((len(states), len(self.env.action_space)))
+        # state has compromised, reachable and one column per service for each machine and
+        # action space is [scan, exploit] for each machine
+        compromised = states.reshape(len(states), self.M, 2 + self.E)[:, :, 0]
+        for i, c in enumerate(compromised):
+            q[i, 2 * np.argmin(c) + 1] = 1
+        return q
+
+    def test_act_batch(self):
+        agent = self.get_agent()
+        agent.brain.q_values = self.exploit_next_machine
+        states = np.stack([self.env.reset().flatten()] * self.N)
+        self.assertTrue(np.array_equal(agent.act_batch(states), np.ones(self.N)))
+
+        agent.epsilon = 1.0
+        actions = agent.act_batch(states)
+        self.assertEqual(actions.shape, (self.N, ))
+        self.assertTrue(((actions >= 0) & (actions < len(self.env.action_space))).all())
+
+    def test_train_truncated_at_max_steps(self):
+        # stub Q-values always choose scan of first machine, so goal is never reached
+        agent = self.get_agent()
+        max_steps = 5
+        num_episodes = 2 * self.N
+        ep_tsteps, ep_rews, ep_times = agent.train(self.env, num_episodes, max_steps)
+        self.assertEqual(ep_tsteps, [max_steps] * num_episodes)
+        self.assertEqual(ep_rews, [-max_steps] * num_episodes)
+        self.assertEqual(agent.steps, num_episodes * max_steps)
+
+    def test_train_auto_reset(self):
+        # each episode exploits every machine in turn, so every copy must restart from the
+        # initial state after reaching the goal
+        agent = self.get_agent()
+        agent.brain.q_values = self.exploit_next_machine
+        num_episodes = 3 * self.N
+        ep_tsteps, ep_rews, ep_times = agent.train(self.env, num_episodes, 10)
+        self.assertEqual(ep_tsteps, [self.M] * num_episodes)
+        self.assertEqual(ep_rews, [17] * num_episodes)
+
+    def test_train_one_replay_per_transition(self):
+        agent = self.get_agent()
+        agent.train(self.env, 2 * self.N, 5)
+        self.assertEqual(agent.brain.train_calls, agent.steps)
+        self.assertEqual(len(agent.memory.samples), agent.steps)
+
+    def test_train_episode_times(self):
+        agent = self.get_agent()
+        start_time = time.perf_counter()
+        ep_tsteps, ep_rews, ep_times = agent.train(self.env, 2 * self.N, 5)
+        training_time = time.perf_counter() - start_time
+        self.assertTrue(all(t > 0 for t in ep_times))
+        self.assertLessEqual(sum(ep_times), training_time)
+        # first episode of each copy runs over the same locksteps, so gets an equal share of time
+        self.assertEqual(ep_times[:self.N], [ep_times[0]] * self.N)
+
+    def test_train_target_update_cadence(self):
+        # target updated once more than 10 steps since last update, i.e. every 3 locksteps of
+        # 4 environments
+        agent = self.get_agent(update_target_freq=10)
+        agent.train(self.env, 2 * self.N, 5)
+        locksteps = agent.steps // self.N
+        self.assertEqual(locksteps, 10)
+        self.assertEqual(agent.brain.target_updates, locksteps // 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,13 @@ for different problems.
 from network_attack_simulator.envs.environment import NetworkAttackSimulator as Cyber
 from network_attack_simulator.agents.dqn import DQNAgent
 from network_attack_simulator.agents.q_learning import QLearningAgent
+from network_attack_simulator.experiments.experiment_util import get_mp_context
 
 import sys
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from copy import deepcopy
-import matplotlib.pyplot as plt
 
 
 # whether to just automatically select hyperparam values based on mean total reward
@@ -81,6 +82,10 @@ scenarios["huge"] = {"machines": 37,
 
 # Environment parameters
 RUNS = 5      # number of runs to do per hyperparameter configuration
+# number of runs to train in parallel processes. Runs are trained with a wall-clock timeout,
+# so parallel runs competing for CPU change the results, only set > 1 if there are enough
+# cores for each run (the DQN agent also uses multiple threads)
+WORKERS = 1
 EVAL_WINDOW = 100      # number of episodes to evaluate policy over
 LEARNING_START = 100    # from which episode to start tracking total rewards
 
@@ -124,10 +129,14 @@ def get_default_agent_params(agent_type):
     return agent_params
 
 
-def run_agent(scenario, agent_type, agent_params):
+def _run_agent_once(scenario, agent_type, agent_params, seed):
     """
-    Run agent on given environment for set number of runs and return averaged
-    rewards (averaged over runs)
+    Train a new agent on a newly generated environment for a single run.
+
+    Defined at module level so it can be sent to worker processes.
+
+    Returns:
+        list ep_rews : total reward recieved per episode
     """
     scenario_params = scenarios[scenario]
     M = scenario_params["machines"]
@@ -137,19 +146,41 @@ def run_agent(scenario, agent_type, agent_params):
     max_steps = scenario_params["steps"]
     timeout = scenario_params["timeout"]
 
-    run_rewards = []
+    env = Cyber.from_params(M, S,
+                            r_sensitive=R_SENS,  r_user=R_USR,
+                            exploit_cost=COST_EXP, scan_cost=COST_SCAN,
+                            restrictiveness=rve, exploit_probs=EXPLOIT_PROB, seed=seed)
+    agent = load_agent(agent_type, env, agent_params)
+    ep_tsteps, ep_rews, ep_times = agent.train(env, num_episodes, max_steps, timeout, VERBOSE)
+    return ep_rews
 
-    for t in range(RUNS):
-        env = Cyber.from_params(M, S,
-                                r_sensitive=R_SENS,  r_user=R_USR,
-                                exploit_cost=COST_EXP, scan_cost=COST_SCAN,
-                                restrictiveness=rve, exploit_probs=EXPLOIT_PROB, seed=t)
-        agent = load_agent(agent_type, env, agent_params)
-        ep_tsteps, ep_rews, ep_times = agent.train(env, num_episodes, max_steps, timeout, VERBOSE)
-        run_rewards.append(ep_rews)
-        print("\t\tRun {} - total reward = {}".format(t, sum(ep_rews)))
 
-    return np.mean(run_rewards, axis=0)
+def run_agent(scenario, agent_type, agent_params):
+    """
+    Run agent on given environment for set number of runs and return averaged
+    rewards (averaged over runs).
+
+    Each run is independent so if WORKERS > 1 runs are trained in parallel processes.
+    """
+    num_episodes = scenarios[scenario]["episodes"]
+    # a run that times out has fewer episodes, missing episodes are counted as zero reward
+    run_rewards = np.zeros((RUNS, num_episodes), dtype=np.float64)
+    run_args = ([scenario] * RUNS, [agent_type] * RUNS, [agent_params] * RUNS, range(RUNS))
+
+    if WORKERS > 1:
+        with ProcessPoolExecutor(max_workers=WORKERS, mp_context=get_mp_context()) as pool:
+            _add_run_rewards(run_rewards, pool.map(_run_agent_once, *run_args))
+    else:
+        _add_run_rewards(run_rewards, map(_run_agent_once, *run_args))
+
+    return run_rewards.mean(axis=0)
+
+
+def _add_run_rewards(run_rewards, runs_ep_rews):
+    """ Store the episode rewards of each run, in run order, as a row of run_rewards """
+    for t, ep_rews in enumerate(runs_ep_rews):
+        run_rewards[t, :len(ep_rews)] = ep_rews
+        print("\t\tRun {} - total reward = {}".format(t, sum(ep_rews)))
 
 
 def test_hyperparam(scenario, agent_type, agent_params, tune_param):
@@ -177,19 +208,23 @@ def report_results(scenario, agent_type, h_param, results):
     """ report the result of running test on given hyperpara
         returns the best hyperparam value
     """
+    # only import when necessary
+    import matplotlib.pyplot as plt
+
     print("\nReporting results for scenario={}, agent={}, hyperparam={}"
           .format(scenario, agent_type, h_param))
 
     for res in results:
         print("\t{} = {}".format(res[0], sum(res[1])))
 
-    for res in results:
-        episodes = list(range(len(res[1])))
-        plt.plot(episodes, np.cumsum(res[1]), label=res[0])
+    # all runs use same number of episodes, so plot every value with a single call
+    episodes = np.arange(len(results[0][1]))
+    cum_rewards = np.cumsum(np.stack([res[1] for res in results]), axis=1)
+    plt.plot(episodes, cum_rewards.T)
 
     plt.ylabel("Cumulative reward")
     plt.xlabel("Episode")
-    plt.legend()
+    plt.legend([res[0] for res in results])
     plt.show()
 
 
@@ -12,6 +12,7 @@ class Action(object):
         3. target: the machine to launch action against. The machine is defined
             by the (subnet, machine_id) tuple
     """
+    __slots__ = ("target", "cost", "type", "service", "prob")
 
     def __init__(self, target, cost, type="scan", service=None, prob=1.0):
         """
@@ -38,7 +39,7 @@ class Action(object):
                     self.target, self.cost, self.type, self.service))
 
     def __hash__(self):
-        return hash(self.__str__())
+        return hash((self.target, self.cost, self.type, self.service))
 
     def __eq__(self, other):
         if self is other:
@@ -2,7 +2,6 @@ import numpy as np
 from network_attack_simulator.envs.network import Network
 from network_attack_simulator.envs.action import Action
 from network_attack_simulator.envs.state import State
-from network_attack_simulator.envs.render import Viewer
 import network_attack_simulator.envs.loader as loader
 import network_attack_simulator.envs.generator as generator
 
@@ -55,9 +54,11 @@ class NetworkAttackSimulator(object):
         self.action_space = Action.load_action_space(self.address_space, self.service_exploits,
                                                      scan_cost)
 
+        self.connected_masks = self._get_connected_masks()
         self.init_state = self._generate_initial_state()
         self.compromised_subnets = None
         self.renderer = None
+        self._outfile_name = None
         self.reset()
 
     @classmethod
@@ -130,6 +131,17 @@ class NetworkAttackSimulator(object):
         self.compromised_subnets = set([loader.INTERNET])
         return self.current_state
 
+    def set_seed(self, seed):
+        """
+        Reseed the random number generator used for non-deterministic actions, leaving the
+        network unchanged. Allows reusing an environment for runs that differ only by seed.
+
+        Arguments:
+            int seed : random seed
+        """
+        self.seed = seed
+        np.random.seed(seed)
+
     def step(self, action):
         """
         Run one step of the environment using action.
@@ -176,7 +188,7 @@ class NetworkAttackSimulator(object):
             str mode : rendering mode
         """
         if self.renderer is None:
-            self.renderer = Viewer(self.network)
+            self._load_renderer()
         if mode == "ASCI":
             self.renderer.render_asci(self.current_state)
         elif mode == "readable":
@@ -195,7 +207,7 @@ class NetworkAttackSimulator(object):
             int height : height of GUI window
         """
         if self.renderer is None:
-            self.renderer = Viewer(self.network)
+            self._load_renderer()
         self.renderer.render_episode(episode)
 
     def render_network_graph(self, initial_state=True, ax=None, show=False):
@@ -210,10 +222,18 @@ class NetworkAttackSimulator(object):
                         handled elsewhere by user
         """
         if self.renderer is None:
-            self.renderer = Viewer(self.network)
+            self._load_renderer()
         state = self.init_state if initial_state else self.current_state
         self.renderer.render_graph(state, ax, show)
 
+    def _load_renderer(self):
+        """
+        Load the renderer. Render module (and so matplotlib, networkx and tkinter) is only
+        imported when rendering is used.
+        """
+        from network_attack_simulator.envs.render import Viewer
+        self.renderer = Viewer(self.network)
+
     def get_state_size(self):
         """
         Get the size of an environment state representation in terms of the number of features,
@@ -312,8 +332,10 @@ class NetworkAttackSimulator(object):
             if not action.is_scan():
                 # successful exploit so machine compromised
                 self.current_state.set_compromised(target)
-                self.compromised_subnets.add(target[0])
-                self._update_reachable(action.target)
+                # reachability only changes the first time a subnet is compromised
+                if target[0] not in self.compromised_subnets:
+                    self.compromised_subnets.add(target[0])
+                    self._update_reachable(action.target)
         # 2. unsuccessful exploit, targeted service may or may not be present so do nothing
 
     def _update_reachable(self, compromised_m):
@@ -324,13 +346,24 @@ class NetworkAttackSimulator(object):
         Arguments:
             (int, int) compromised_m : compromised machine address
         """
-        comp_subnet = compromised_m[0]
-        for m in self.address_space:
-            if self.current_state.reachable(m):
-                continue
-            m_subnet = m[0]
-            if self.network.subnets_connected(comp_subnet, m_subnet):
-                self.current_state.set_reachable(m)
+        self.current_state.set_reachable_mask(self.connected_masks[compromised_m[0]])
+
+    def _get_connected_masks(self):
+        """
+        Get a mask over machines (in address space order) for each subnet, where a machine is
+        set if it is on a subnet directly connected to that subnet. Reachability can then be
+        updated with a single vectorized OR rather than checking every machine.
+
+        Returns:
+            ndarray connected_masks : 2D array of shape (num subnets, num machines)
+        """
+        num_subnets = self.network.get_number_of_subnets()
+        connected_masks = np.zeros((num_subnets, len(self.address_space)), dtype=np.int8)
+        for subnet in range(num_subnets):
+            for i, m in enumerate(self.address_space):
+                if self.network.subnets_connected(subnet, m[0]):
+                    connected_masks[subnet, i] = 1
+        return connected_masks
 
     def _is_goal(self):
         """
@@ -359,6 +392,9 @@ class NetworkAttackSimulator(object):
         Output format:
             <list of size of each subnet>_<number of services>_<det or stoch>
         """
-        output = "{}_".format(self.network.subnets)
-        output += "{}_".format(self.num_services)
-        return output
+        # network doesn't change after construction, so only need to generate name once
+        if self._outfile_name is None:
+            output = "{}_".format(self.network.subnets)
+            output += "{}_".format(self.num_services)
+            self._outfile_name = output
+        return self._outfile_name
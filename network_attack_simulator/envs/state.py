@@ -1,6 +1,5 @@
 import numpy as np
 from collections import OrderedDict
-from copy import deepcopy
 
 # keys
 COMPROMISED_KEY = "compromised"
@@ -21,23 +20,24 @@ class State(object):
     A state in the cyber attack simulator environment.
 
     Properties:
-        - OrderedDict obs : a dictionary with the address of each machine as the
-            key and values being a list of values of state variables
+        - ndarray obs : a 2D array with one row for each machine (in order of machine index)
+            and one column for each state variable
 
     State variables:
         - Defined by :
-            1. compromised : True/False
-            2. reachable : True/False (whether machine is currently reachable)
-            3. service_info : list of knowledge for each service (UNKNOWN, PRESENT, ABSENT)
+            1. compromised : 1/0 (column COMPROMISED)
+            2. reachable : 1/0 (column REACHABLE, whether machine is currently reachable)
+            3. service_info : knowledge for each service (UNKNOWN, PRESENT, ABSENT)
+                (remaining columns, in order of service index)
 
     Main methods:
         - reachable : whether a given machine is reachable
         - compromised : whether a given machine is compromised
         - service_state : get the knowledge state for a given service and machine
     """
-    # class variable that maps machine address to vector position
+    # class variable that maps machine address to row in state
     machine_indices = {}
-    # class variable that maps service ID to vector position
+    # class variable that maps service ID to column position
     service_indices = {}
     # class variable
     m_state_size = 0
@@ -47,38 +47,13 @@ class State(object):
         Initialize new state object.
 
         Arguments:
-            OrderedDict obs : a dictionary with the address of each machine as the
-                key and values a dictionary of machine state
+            ndarray obs : a 2D array of machine states, with shape (num machines, m_state_size)
         """
         self._obs = obs
-        self._vector = self._vectorize()
-
-    def _vectorize(self):
-        """
-        Convert observation map into a 1D vector.
-        Vector contains compromised, reachable, srv1, .. , srvN in order of machine index
-
-        Returns:
-            numpy state_vector : state as a 1D numpy array
-        """
-        M = len(self._obs)
-        vector = np.zeros(M * State.m_state_size, dtype=np.int8)
-        for m, m_state in self._obs.items():
-            m_i = self._get_machine_index(m)
-            for k, v in m_state.items():
-                # int(v) since compromised and reachable are bools in map
-                if k == COMPROMISED_KEY:
-                    vector[m_i + COMPROMISED] = int(v)
-                elif k == REACHABLE_KEY:
-                    vector[m_i + REACHABLE] = int(v)
-                else:
-                    srv_i = self._get_service_index(k)
-                    vector[m_i + srv_i] = v
-        return vector
 
     def _get_machine_index(self, m):
         """
-        Get the index of a machine in state vector
+        Get the row of a machine in state
 
         Arguments:
             (int, int) m : the machine address
@@ -86,11 +61,11 @@ class State(object):
         Returns:
             int index : the index of the machine
         """
-        return State.machine_indices[m] * State.m_state_size
+        return State.machine_indices[m]
 
     def _get_service_index(self, srv):
         """
-        Get the index of a service in state vector
+        Get the column of a service in state
 
         Arguments:
             int or str srv : the service ID
@@ -110,7 +85,7 @@ class State(object):
         Returns:
             bool reachable : True if reachable
         """
-        return self._obs[target][REACHABLE_KEY]
+        return self._obs[State.machine_indices[target], REACHABLE] == 1
 
     def compromised(self, target):
         """
@@ -122,7 +97,7 @@ class State(object):
         Returns:
             bool compromised : True if compromised
         """
-        return self._obs[target][COMPROMISED_KEY]
+        return self._obs[State.machine_indices[target], COMPROMISED] == 1
 
     def service_state(self, target, service):
         """
@@ -135,7 +110,7 @@ class State(object):
         Returns
             int service_state : state of service
         """
-        return self._obs[target][service]
+        return self._obs[self._get_machine_index(target), self._get_service_index(service)]
 
     def update_service(self, target, service, present):
         """
@@ -148,12 +123,7 @@ class State(object):
         """
         t_index = self._get_machine_index(target)
         s_index = self._get_service_index(service)
-        if present:
-            self._obs[target][service] = PRESENT
-            self._vector[t_index + s_index] = PRESENT
-        else:
-            self._obs[target][service] = ABSENT
-            self._vector[t_index + s_index] = ABSENT
+        self._obs[t_index, s_index] = PRESENT if present else ABSENT
 
     def set_compromised(self, target):
         """
@@ -162,9 +132,7 @@ class State(object):
         Arguments:
             (int, int) target : the target machine address
         """
-        self._obs[target][COMPROMISED_KEY] = True
-        t_index = self._get_machine_index(target)
-        self._vector[t_index + COMPROMISED] = int(True)
+        self._obs[State.machine_indices[target], COMPROMISED] = 1
 
     def set_reachable(self, target):
         """
@@ -173,9 +141,17 @@ class State(object):
         Arguments:
             (int, int) target : the target machine address
         """
-        self._obs[target][REACHABLE_KEY] = True
-        t_index = self._get_machine_index(target)
-        self._vector[t_index + REACHABLE] = int(True)
+        self._obs[State.machine_indices[target], REACHABLE] = 1
+
+    def set_reachable_mask(self, mask):
+        """
+        Set every machine in mask as reachable, leaving already reachable machines as is
+
+        Arguments:
+            ndarray mask : 1D array with 1 for each machine to set reachable, in order of
+                machine index
+        """
+        self._obs[:, REACHABLE] |= mask
 
     def copy(self):
         """
@@ -184,10 +160,7 @@ class State(object):
         Returns:
             State copy : a copy of this state
         """
-        obs_copy = OrderedDict()
-        for m, v in self._obs.items():
-            obs_copy[m] = deepcopy(v)
-        return State(obs_copy)
+        return State(self._obs.copy())
 
     def flatten(self):
         """
@@ -197,16 +170,16 @@ class State(object):
         Returns:
             ndarray flattened : state as a 1D numpy array
         """
-        return self._vector.copy()
+        return self._obs.flatten()
 
     def get_hashable(self):
         """
         Return a copy of the state in an efficient hashable form.
 
         Returns:
-            str hashable : state vector as hashable string
+            bytes hashable : state as hashable bytes
         """
-        return self._vector.tostring()
+        return self._obs.tobytes()
 
     def get_state_size(self):
         """
@@ -215,20 +188,26 @@ class State(object):
         Returns:
             int state_size : size of flattened state
         """
-        return self._vector.shape[0]
+        return self._obs.size
 
     def __str__(self):
-        return str(self._obs)
+        output = OrderedDict()
+        for m, m_i in State.machine_indices.items():
+            m_state = OrderedDict()
+            m_state[COMPROMISED_KEY] = bool(self._obs[m_i, COMPROMISED])
+            m_state[REACHABLE_KEY] = bool(self._obs[m_i, REACHABLE])
+            for srv in State.service_indices.keys():
+                m_state[srv] = int(self._obs[m_i, self._get_service_index(srv)])
+            output[m] = m_state
+        return str(output)
 
     def __hash__(self):
-        return hash(self._vector.tostring())
+        return hash(self._obs.tobytes())
 
     def __eq__(self, other):
         if not isinstance(other, State):
             return False
-        if len(self._obs) != len(other._obs):
-            return False
-        return np.array_equal(self._vector, other._vector)
+        return np.array_equal(self._obs, other._obs)
 
     @staticmethod
     def generate_initial_state(network, exploitable_services):
@@ -244,25 +223,17 @@ class State(object):
         Returns:
             State initial_state : the initial state of the environment
         """
-        obs = OrderedDict()
-
+        State.service_indices = {}
         for srv, i in exploitable_services.items():
             State.service_indices[srv] = i
 
         State.m_state_size = len(exploitable_services) + 2
 
-        for i, m in enumerate(network.get_address_space()):
-            # machine state is a mapping from service, or status var to value
-            # also index which is used when vectorizing state
+        address_space = network.get_address_space()
+        State.machine_indices = {}
+        # no machines compromised and all services UNKNOWN
+        obs = np.zeros((len(address_space), State.m_state_size), dtype=np.int8)
+        for i, m in enumerate(address_space):
             State.machine_indices[m] = i
-            machine_state = OrderedDict()
-            machine_state[COMPROMISED_KEY] = False
-            if network.subnet_exposed(m[0]):
-                machine_state[REACHABLE_KEY] = True
-            else:
-                machine_state[REACHABLE_KEY] = False
-            for srv in exploitable_services.keys():
-                machine_state[srv] = UNKNOWN
-            obs[m] = machine_state
-        initial_state = State(obs)
-        return initial_state
+            obs[i, REACHABLE] = int(network.subnet_exposed(m[0]))
+        return State(obs)
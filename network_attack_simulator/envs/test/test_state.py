@@ -26,6 +26,15 @@ class StateTestCase(unittest.TestCase):
         actual_flat = self.init_state.flatten()
         self.assertTrue(np.equal(expected_flat, actual_flat).all())
 
+    def test_state_set_reachable_mask(self):
+        state = self.init_state.copy()
+        state.set_reachable_mask(np.array([0, 1, 1], dtype=np.int8))
+        expected_flat = np.array([[0, 1, 0, 0, 1, 0, 0, 1, 0]])
+        self.assertTrue(np.equal(expected_flat, state.flatten()).all())
+        # original state unchanged
+        init_flat = np.array([[0, 1, 0, 0, 0, 0, 0, 0, 0]])
+        self.assertTrue(np.equal(init_flat, self.init_state.flatten()).all())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from network_attack_simulator.envs.environment import NetworkAttackSimulator
+from network_attack_simulator.envs.vector_env import VectorNetworkAttackSimulator
+
+
+class VectorEnvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.E = 1
+        self.M = 3
+        self.N = 4
+        self.env = NetworkAttackSimulator.from_params(self.M, self.E, exploit_probs=1.0)
+        self.venv = VectorNetworkAttackSimulator.from_env(self.env, self.N)
+        self.init_obs = self.env.reset().flatten()
+
+    def test_reset(self):
+        obs = self.venv.reset()
+        self.assertEqual(obs.shape, (self.N, self.env.get_state_size()))
+        for o in obs:
+            self.assertTrue(np.array_equal(o, self.init_obs))
+
+    def test_step_scan(self):
+        self.venv.reset()
+        # first action in action space is scan of first machine
+        obs, rewards, dones = self.venv.step(np.zeros(self.N, dtype=int))
+        expected_obs, expected_r, expected_d = self.env.step(self.env.action_space[0])
+        self.assertEqual(obs.shape, (self.N, self.env.get_state_size()))
+        for i in range(self.N):
+            self.assertTrue(np.array_equal(obs[i], expected_obs.flatten()))
+            self.assertEqual(rewards[i], expected_r)
+            self.assertEqual(dones[i], expected_d)
+
+    def test_step_auto_reset(self):
+        self.venv.reset()
+        # exploit each machine in order, action space is [scan, exploit] for each machine
+        for a in [1, 3]:
+            _, _, dones = self.venv.step(np.full(self.N, a))
+            self.assertFalse(dones.any())
+        obs, _, dones = self.venv.step(np.full(self.N, 5))
+        self.assertTrue(dones.all())
+        for o in obs:
+            self.assertTrue(np.array_equal(o, self.init_obs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import numpy as np
+from copy import deepcopy
+
+
+class VectorNetworkAttackSimulator(object):
+    """
+    A batch of independent NetworkAttackSimulator environments that are stepped in lockstep.
+
+    Observations are returned as the flattened state of each environment stacked into a single
+    2D array, so an agent can choose actions for every environment with one batched forward pass.
+
+    Properties:
+    - envs : list of child environments
+    - num_envs : number of child environments
+    - action_space : the set of all actions allowed for each child environment
+    """
+
+    def __init__(self, envs):
+        """
+        Construct a new vectorized environment
+
+        Arguments:
+            list envs : list of NetworkAttackSimulator environments, all with the same
+                        action space
+        """
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.action_space = envs[0].action_space
+
+    @classmethod
+    def from_env(cls, env, num_envs):
+        """
+        Construct a new vectorized environment from copies of a single environment.
+
+        Arguments:
+            NetworkAttackSimulator env : environment to copy
+            int num_envs : number of copies of environment to step in parallel
+
+        Returns:
+            VectorNetworkAttackSimulator venv : a new vectorized environment object
+        """
+        return cls([deepcopy(env) for _ in range(num_envs)])
+
+    def reset(self):
+        """
+        Reset every child environment.
+
+        Returns:
+            ndarray obs : initial state of each environment, shape (num_envs, state_size)
+        """
+        return np.stack([env.reset().flatten() for env in self.envs])
+
+    def reset_env(self, i):
+        """
+        Reset a single child environment (e.g. when an episode hits the step limit).
+
+        Arguments:
+            int i : index of environment to reset
+
+        Returns:
+            ndarray obs : initial state of environment, shape (state_size, )
+        """
+        return self.envs[i].reset().flatten()
+
+    def step(self, actions):
+        """
+        Run one step of every child environment. Environments that reach the goal are reset
+        automatically, and the observation returned for them is the new initial state.
+
+        Arguments:
+            list actions : index into action_space of the action to perform in each environment
+
+        Returns:
+            ndarray obs : state of each environment, shape (num_envs, state_size)
+            ndarray rewards : reward from performing each action, shape (num_envs, )
+            ndarray dones : whether each episode ended, shape (num_envs, )
+        """
+        obs = []
+        rewards = np.empty(self.num_envs, dtype=np.float64)
+        dones = np.empty(self.num_envs, dtype=bool)
+        for i, env in enumerate(self.envs):
+            o, rewards[i], dones[i] = env.step(self.action_space[actions[i]])
+            if dones[i]:
+                o = env.reset()
+            obs.append(o.flatten())
+        return np.stack(obs), rewards, dones
@@ -7,10 +7,13 @@ Gets results for multiple agents and scenarios
     - time vs episode
 """
 import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from network_attack_simulator.envs.environment import NetworkAttackSimulator as Cyber
 from network_attack_simulator.experiments.experiment_util import get_scenario
 from network_attack_simulator.experiments.experiment_util import get_scenario_env
 from network_attack_simulator.experiments.experiment_util import get_agent
+from network_attack_simulator.experiments.experiment_util import get_mp_context
 
 # To control progress message printing for individual episodes within runs
 VERBOSE = False
@@ -37,6 +40,10 @@ COST_EXP = COST_SCAN = 1
 
 # Experiment parameters
 SCALING_RUNS = 3
+# number of scaling experiment runs to do in parallel processes. Runs are trained with a
+# wall-clock TIMEOUT, so parallel runs competing for CPU change the results, only set > 1
+# if there are enough cores for each run (the DQN agent also uses multiple threads)
+SCALING_WORKERS = 1
 MACHINE_MIN = 18
 MACHINE_MAX = 18
 MACHINE_INTERVAL = 1
@@ -75,8 +82,14 @@ def run_experiment(scenario, agent_name, result_file, eval_file):
 
     print("\nRunning experiment: Scenario={}, agent={}".format(scenario, agent_name))
 
+    env = None
     for t in range(RUNS):
-        env, _ = get_scenario_env(scenario, t)
+        if env is None or scenario_params["generate"]:
+            env, _ = get_scenario_env(scenario, t)
+        else:
+            # network loaded from file doesn't depend on seed, so only need to reseed
+            env.set_seed(t)
+            env.reset()
         agent = get_agent(agent_name, scenario, env)
         if agent_name != "random":
             ep_tsteps, ep_rews, ep_times = agent.train(env, num_episodes, max_steps, timeout,
@@ -91,65 +104,108 @@ def run_experiment(scenario, agent_name, result_file, eval_file):
         run_evaluation(agent, env, scenario, agent_name, max_steps, t, eval_file)
 
 
-def run_scaling_experiment(agent_name, eval_file):
+def run_scaling_job(agent_name, m, s, t):
+    """
+    Train and evaluate an agent on a single generated environment for the scaling experiment.
 
-    print("\nRunning scaling analysis for agent: \n\t {0}".format(str(agent_name)))
+    Defined at module level so it can be run in a worker process.
 
-    for m in range(MACHINE_MIN, MACHINE_MAX + 1, MACHINE_INTERVAL):
-        for s in range(SERVICE_MIN, SERVICE_MAX + 1, SERVICE_INTERVAL):
-            print("\n>> Machines={0} Services={1}".format(m, s))
-            for t in range(START_SEED, START_SEED + SCALING_RUNS):
-                print("\tRun {0} of {1} seed={2}".format(t+1, SCALING_RUNS+START_SEED, t))
-                env = Cyber.from_params(m, s,
-                                        r_sensitive=R_SENS,  r_user=R_USR,
-                                        exploit_cost=COST_EXP, scan_cost=COST_SCAN,
-                                        restrictiveness=RVE, exploit_probs=EXPLOIT_PROB,
-                                        seed=t)
-                print("Agent name")
-                agent = get_agent(agent_name, "default", env)
+    Returns:
+        list results : (timesteps, reward, solved) tuple for each evaluation episode
+    """
+    env = Cyber.from_params(m, s,
+                            r_sensitive=R_SENS,  r_user=R_USR,
+                            exploit_cost=COST_EXP, scan_cost=COST_SCAN,
+                            restrictiveness=RVE, exploit_probs=EXPLOIT_PROB,
+                            seed=t)
+    agent = get_agent(agent_name, "default", env)
+
+    if agent_name != "random":
+        ep_tsteps, ep_rews, ep_times = agent.train(env, MAX_EPISODES, MAX_STEPS,
+                                                   TIMEOUT, VERBOSE)
+        path_found = is_path_found(ep_tsteps, MAX_STEPS)
+        exp_reward = get_expected_rewards(ep_rews)
+        training_time = sum(ep_times)
+        print("\tTraining agent={} M={} S={} run {} - path_found={} - exp_reward={} "
+              "- train_time={:.2f}"
+              .format(agent_name, m, s, t, path_found, exp_reward, training_time))
+
+    return run_evaluation_episodes(agent, env, MAX_STEPS)
+
+
+def run_scaling_experiment(agent_names, eval_file):
+    """
+    Run scaling experiment for each agent. Every (agent, machines, services, seed) run is
+    independent, so if SCALING_WORKERS > 1 runs are done in parallel processes, with results
+    written in order by the main process.
+    """
+    print("\nRunning scaling analysis for agents: \n\t {0}".format(str(agent_names)))
+
+    jobs = [(a, m, s, t)
+            for a in agent_names
+            for m in range(MACHINE_MIN, MACHINE_MAX + 1, MACHINE_INTERVAL)
+            for s in range(SERVICE_MIN, SERVICE_MAX + 1, SERVICE_INTERVAL)
+            for t in range(START_SEED, START_SEED + SCALING_RUNS)]
+    job_args = list(zip(*jobs))
+
+    if SCALING_WORKERS > 1:
+        # don't leave buffered output to be inherited by forked workers
+        eval_file.flush()
+        with ProcessPoolExecutor(max_workers=SCALING_WORKERS,
+                                 mp_context=get_mp_context()) as pool:
+            write_scaling_results(eval_file, jobs, pool.map(run_scaling_job, *job_args))
+    else:
+        write_scaling_results(eval_file, jobs, map(run_scaling_job, *job_args))
 
-                if agent_name != "random":
-                    ep_tsteps, ep_rews, ep_times = agent.train(env, MAX_EPISODES, MAX_STEPS,
-                                                               TIMEOUT, VERBOSE)
-                    path_found = is_path_found(ep_tsteps, MAX_STEPS)
-                    exp_reward = get_expected_rewards(ep_rews)
-                    training_time = sum(ep_times)
-                    print("\tTraining run {} - path_found={} - exp_reward={} - train_time={:.2f}"
-                          .format(t, path_found, exp_reward, training_time))
 
-                run_evaluation(agent, env, (m, s), agent_name, MAX_STEPS, t, eval_file)
+def write_scaling_results(eval_file, jobs, job_results):
+    """ Write and print the evaluation results of each scaling experiment job, in job order """
+    for (agent_name, m, s, t), results in zip(jobs, job_results):
+        print("\n>> Agent={0} Machines={1} Services={2} seed={3}".format(agent_name, m, s, t))
+        write_results_eval(eval_file, (m, s), agent_name, t, results)
+        print_evaluation_results(results)
 
 
 def run_evaluation(agent, env, scenario, agent_name, max_steps, run, eval_file):
     """
-    Evaluate a trained agent
+    Evaluate a trained agent and write the results to eval_file
     """
-    tsteps_sum = 0
-    reward_sum = 0
-    solved_sum = 0
-    for erun in range(EVAL_RUNS):
-        tsteps, reward, solved = agent.evaluate_agent(env, max_steps, EVAL_EPSILON)
-        write_results_eval(eval_file, scenario, agent_name, run, erun, tsteps, reward, solved)
-        tsteps_sum += tsteps
-        reward_sum += reward
-        solved_sum += int(solved)
+    results = run_evaluation_episodes(agent, env, max_steps)
+    write_results_eval(eval_file, scenario, agent_name, run, results)
+    print_evaluation_results(results)
+
+
+def print_evaluation_results(results):
+    """ Print summary of evaluation results """
+    tsteps, rewards, solved = (np.array(r) for r in zip(*results))
     print("\t\tEvaluation results - mean timesteps={:.2f} - mean reward={:.2f} - solved={:.2f}"
-          .format(tsteps_sum / EVAL_RUNS, reward_sum / EVAL_RUNS, solved_sum / EVAL_RUNS))
+          .format(tsteps.mean(), rewards.mean(), solved.mean()))
+
+
+def run_evaluation_episodes(agent, env, max_steps):
+    """
+    Run EVAL_RUNS evaluation episodes
+
+    Returns:
+        list results : (timesteps, reward, solved) tuple for each episode, in evalrun order
+    """
+    return [agent.evaluate_agent(env, max_steps, EVAL_EPSILON) for _ in range(EVAL_RUNS)]
 
 
 def write_results_eps(result_file, scenario, agent, run, timesteps, rewards, times):
-    """ Write results to file """
-    for e in range(len(timesteps)):
-        # scenario,agent,run,episode,timesteps,rewards,time
-        result_file.write("{0},{1},{2},{3},{4},{5},{6:.8f}\n".format(scenario, agent, run, e,
-                          timesteps[e], rewards[e], times[e]))
+    """ Write results to file, as a single write for all episodes """
+    # scenario,agent,run,episode,timesteps,rewards,time
+    row = "{0},{1},{2},{{0}},{{1}},{{2}},{{3:.8f}}\n".format(scenario, agent, run)
+    result_file.write("".join(row.format(e, timesteps[e], rewards[e], times[e])
+                              for e in range(len(timesteps))))
 
 
-def write_results_eval(eval_file, scenario, agent, run, evalrun, timesteps, reward, solved):
-    """ Write results to file """
+def write_results_eval(eval_file, scenario, agent, run, results):
+    """ Write results of each evaluation run to file, as a single write """
     # scenario,agent,run,evalrun,timesteps,rewards, solved
-    eval_file.write("{0},{1},{2},{3},{4},{5},{6}\n".format(scenario, agent, run, evalrun, timesteps,
-                    reward, solved))
+    row = "{0},{1},{2},{{0}},{{1}},{{2}},{{3}}\n".format(scenario, agent, run)
+    eval_file.write("".join(row.format(erun, timesteps, reward, solved)
+                            for erun, (timesteps, reward, solved) in enumerate(results)))
 
 
 def main():
@@ -176,10 +232,10 @@ def main():
         result_file.write("scenario,agent,run,episode,timesteps,rewards,time\n")
         eval_file.write("scenario,agent,run,evalrun,timesteps,reward,solved\n")
 
-    for agent_name in agent_list:
-        if scenario == "scaling":
-            run_scaling_experiment(agent_name, eval_file)
-        else:
+    if scenario == "scaling":
+        run_scaling_experiment(agent_list, eval_file)
+    else:
+        for agent_name in agent_list:
             run_experiment(scenario, agent_name, result_file, eval_file)
 
     result_file.close()
@@ -42,13 +42,18 @@ def smooth_reward(rewards, I):
     return avg_rewards
 
 
-def plot_average_reward_per_episode(ax, scenario_df, max_reward):
+def plot_average_rewards(ep_ax, time_ax, scenario_df, max_reward):
+    """
+    Plot mean episode reward vs training episode on ep_ax and mean episode reward vs training
+    time on time_ax. Averaged data for each agent is computed once and used for both plots.
+    """
 
-    print("plot_average_reward_per_episode")
+    print("plot_average_rewards")
 
     # ax.set_title("Average reward per episode")
     agents = scenario_df.agent.unique()
     max_episodes = 0
+    max_time = 0
     for agent in agents:
         print("\t", agent)
         agent_df = scenario_df.loc[scenario_df["agent"] == agent]
@@ -56,47 +61,45 @@ def plot_average_reward_per_episode(ax, scenario_df, max_reward):
         rewards = avg_df["rewards"]
         avg_rewards = smooth_reward(rewards, WINDOW)
         err = agent_df.groupby(["scenario", "agent", "episode"]).sem().reset_index()["rewards"]
+        label = get_agent_label(agent)
+
         episodes = list(range(0, len(rewards)))
         print("episodes:", len(episodes))
         if len(episodes) > max_episodes:
             max_episodes = len(episodes)
-        ax.plot(episodes, avg_rewards, label=get_agent_label(agent))
-        ax.fill_between(episodes, avg_rewards-err, avg_rewards+err, alpha=0.4)
-
-    episodes = list(range(0, max_episodes))
-    max_rewards = np.full(max_episodes, max_reward)
-    ax.plot(episodes, max_rewards, label="Theoretical Max", linestyle="--")
-
-    ax.set_xlabel("Training Episode")
-    ax.set_xscale("log")
-    ax.set_ylabel("Mean episode reward")
-
+        ep_ax.plot(episodes, avg_rewards, label=label)
+        ep_ax.fill_between(episodes, avg_rewards-err, avg_rewards+err, alpha=0.4)
 
-def plot_average_reward_vs_time(ax, scenario_df, max_reward):
-
-    print("plot_average_reward_vs_time")
-
-    agents = scenario_df.agent.unique()
-    max_time = 0
-    for agent in agents:
-        print("\t", agent)
-        agent_df = scenario_df.loc[scenario_df["agent"] == agent]
-        avg_df = average_data_over_runs(agent_df)
-        rewards = avg_df["rewards"]
-        avg_rewards = smooth_reward(rewards, WINDOW)
-        err = agent_df.groupby(["scenario", "agent", "episode"]).sem().reset_index()["rewards"]
         times = np.cumsum(avg_df["time"])
         if times.max() > max_time:
             max_time = times.max()
-        ax.plot(times, avg_rewards, label=get_agent_label(agent))
-        ax.fill_between(times, avg_rewards-err, avg_rewards+err, alpha=0.4)
+        time_ax.plot(times, avg_rewards, label=label)
+        time_ax.fill_between(times, avg_rewards-err, avg_rewards+err, alpha=0.4)
+
+    episodes = list(range(0, max_episodes))
+    max_rewards = np.full(max_episodes, max_reward)
+    ep_ax.plot(episodes, max_rewards, label="Theoretical Max", linestyle="--")
+
+    ep_ax.set_xlabel("Training Episode")
+    ep_ax.set_xscale("log")
+    ep_ax.set_ylabel("Mean episode reward")
 
     max_times = np.linspace(0, max_time, 0.1)
     max_rewards = np.full(len(max_times), max_reward)
-    ax.plot(max_times, max_rewards, label="Theoretical Max", linestyle="--")
+    time_ax.plot(max_times, max_rewards, label="Theoretical Max", linestyle="--")
+
+    time_ax.set_xlabel("Training time (seconds)")
+    time_ax.set_ylabel("Mean episode reward")
+
 
-    ax.set_xlabel("Training time (seconds)")
-    ax.set_ylabel("Mean episode reward")
+def add_legend(fig, ax, rows, cols, plot_count):
+    """ Add legend for plots on ax to last subplot of figure """
+    handles, labels = ax.get_legend_handles_labels()
+    ax_end = fig.add_subplot(rows, cols, plot_count)
+    ax_end.legend(handles, labels, loc="upper center")
+    ax_end.axis('off')
+    # fig.legend(handles, labels, loc='lower right')
+    fig.tight_layout()
 
 
 def main():
@@ -110,33 +113,8 @@ def main():
     scenarios = results_df.scenario.unique()
     # fig, axes = plt.subplots(nrows=len(scenarios), ncols=1, squeeze=False)
 
+    # figure 1 is average reward per episode, figure 2 is average reward vs time
     fig = plt.figure(1, figsize=(8, 8))
-    # +1 for legend
-    plot_count = len(scenarios) + 1
-    rows = (plot_count + 1) // 2
-    cols = 1 if plot_count == 1 else 2
-    title_vals = ["a)", "b)", "c)", "d)", "e)", "f)"]
-
-    print("Start plotting aerage reward per episode")
-    for i, scenario in enumerate(scenarios):
-        print(">>Scenario = ", scenario)
-        if i == 0:
-            ax = fig.add_subplot(rows, cols, i + 1)
-        else:
-            ax = fig.add_subplot(rows, cols, i + 1)
-        # ax = axes[i, 0]
-        ax.set_title((title_vals[i] + " " + scenario), loc='left')
-        scenario_df = get_scenario_df(results_df, scenario)
-        scenario_max = get_scenario_max(scenario)
-        plot_average_reward_per_episode(ax, scenario_df, scenario_max)
-
-    handles, labels = ax.get_legend_handles_labels()
-    ax_end = fig.add_subplot(rows, cols, plot_count)
-    ax_end.legend(handles, labels, loc="upper center")
-    ax_end.axis('off')
-    # fig.legend(handles, labels, loc='lower right')
-    fig.tight_layout()
-
     fig2 = plt.figure(2, figsize=(8, 8))
     # +1 for legend
     plot_count = len(scenarios) + 1
@@ -144,25 +122,20 @@ def main():
     cols = 1 if plot_count == 1 else 2
     title_vals = ["a)", "b)", "c)", "d)", "e)", "f)"]
 
-    print("Start plotting average reward vs time")
+    print("Start plotting average reward per episode and vs time")
     for i, scenario in enumerate(scenarios):
         print(">>Scenario = ", scenario)
-        if i == 0:
-            ax = fig2.add_subplot(rows, cols, i + 1)
-        else:
-            ax = fig2.add_subplot(rows, cols, i + 1)
+        ax = fig.add_subplot(rows, cols, i + 1)
+        ax2 = fig2.add_subplot(rows, cols, i + 1)
         # ax = axes[i, 0]
         ax.set_title((title_vals[i] + " " + scenario), loc='left')
+        ax2.set_title((title_vals[i] + " " + scenario), loc='left')
         scenario_df = get_scenario_df(results_df, scenario)
         scenario_max = get_scenario_max(scenario)
-        plot_average_reward_vs_time(ax, scenario_df, scenario_max)
+        plot_average_rewards(ax, ax2, scenario_df, scenario_max)
 
-    handles, labels = ax.get_legend_handles_labels()
-    ax_end = fig2.add_subplot(rows, cols, plot_count)
-    ax_end.legend(handles, labels, loc="upper center")
-    ax_end.axis('off')
-    # fig.legend(handles, labels, loc='lower right')
-    fig2.tight_layout()
+    add_legend(fig, ax, rows, cols, plot_count)
+    add_legend(fig2, ax2, rows, cols, plot_count)
 
     plt.show()
 
@@ -1,3 +1,4 @@
+import multiprocessing
 from collections import OrderedDict
 from network_attack_simulator.envs.environment import NetworkAttackSimulator as Cyber
 from network_attack_simulator.agents.q_learning import QLearningAgent
@@ -10,6 +11,11 @@ EXPLOIT_PROB = "mixed"
 R_SENS = R_USR = 10
 COST_EXP = COST_SCAN = 1
 
+# number of environments DQN agent collects samples from in lockstep. Values > 1 batch action
+# selection, but episodes from different environment copies are interleaved in the results, so
+# only set > 1 when results don't need to be compared with earlier single environment runs
+DQN_NUM_ENVS = 1
+
 
 # experiment scenarios
 scenarios = OrderedDict()
@@ -176,7 +182,7 @@ def get_agent(agent_name, scenario_name, env):
         num_actions = env.get_num_actions()
         print("State size=", state_size)
         print("Num actions=", num_actions)
-        return DQNAgent(state_size, num_actions, **agent_params)
+        return DQNAgent(state_size, num_actions, num_envs=DQN_NUM_ENVS, **agent_params)
     return QLearningAgent(**agent_params)
 
 
@@ -193,3 +199,10 @@ def get_agent_label(agent_name):
     elif agent_name == "random":
         return "Random"
     return None
+
+
+def get_mp_context():
+    """ Use fork where available so worker processes don't need to re-import modules """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()